@@ -0,0 +1,9 @@
+-- Migration script to add a covering index for full-table exports
+-- The index matches the ORDER BY and column list of scripts/dump_tweets_to_csv.py,
+-- so the dump is answered from the index without sorting or table lookups
+
+CREATE INDEX IF NOT EXISTS idx_tweets_dump_cover
+    ON tweets(created_at_parsed DESC, created_at DESC, user_name, text, link_to_tweet);
+
+-- Refresh planner statistics so the new index is considered
+PRAGMA optimize;
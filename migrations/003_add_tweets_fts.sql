@@ -0,0 +1,27 @@
+-- Migration script to add a full-text index on tweet text
+-- The trigram tokenizer matches arbitrary substrings case-insensitively,
+-- like the previous LIKE '%...%' search, but through an inverted index
+
+CREATE VIRTUAL TABLE IF NOT EXISTS tweets_fts USING fts5(
+    text,
+    content='tweets',
+    content_rowid='id',
+    tokenize='trigram'
+);
+
+-- Keep the index in sync with the tweets table
+CREATE TRIGGER IF NOT EXISTS tweets_fts_ai AFTER INSERT ON tweets BEGIN
+    INSERT INTO tweets_fts(rowid, text) VALUES (new.id, new.text);
+END;
+
+CREATE TRIGGER IF NOT EXISTS tweets_fts_ad AFTER DELETE ON tweets BEGIN
+    INSERT INTO tweets_fts(tweets_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+
+CREATE TRIGGER IF NOT EXISTS tweets_fts_au AFTER UPDATE OF text ON tweets BEGIN
+    INSERT INTO tweets_fts(tweets_fts, rowid, text) VALUES ('delete', old.id, old.text);
+    INSERT INTO tweets_fts(rowid, text) VALUES (new.id, new.text);
+END;
+
+-- Index tweets that already exist
+INSERT INTO tweets_fts(tweets_fts) VALUES ('rebuild');
@@ -0,0 +1,10 @@
+-- Migration script to track how far tweets have been added to ChromaDB
+-- max_tweet_id starts out NULL, meaning unknown; populate_chromadb then starts
+-- from the first tweet, skipping those ChromaDB already holds, and advances it
+
+CREATE TABLE IF NOT EXISTS chroma_state (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    max_tweet_id INTEGER
+);
+
+INSERT OR IGNORE INTO chroma_state (id, max_tweet_id) VALUES (1, NULL);
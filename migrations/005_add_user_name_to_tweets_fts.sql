@@ -0,0 +1,34 @@
+-- Migration script to index user names in the full-text table as well
+-- Lets 'from:' searches use the trigram index instead of scanning user_name
+
+DROP TRIGGER IF EXISTS tweets_fts_ai;
+DROP TRIGGER IF EXISTS tweets_fts_ad;
+DROP TRIGGER IF EXISTS tweets_fts_au;
+DROP TABLE IF EXISTS tweets_fts;
+
+CREATE VIRTUAL TABLE tweets_fts USING fts5(
+    user_name,
+    text,
+    content='tweets',
+    content_rowid='id',
+    tokenize='trigram'
+);
+
+-- Keep the index in sync with the tweets table
+CREATE TRIGGER tweets_fts_ai AFTER INSERT ON tweets BEGIN
+    INSERT INTO tweets_fts(rowid, user_name, text) VALUES (new.id, new.user_name, new.text);
+END;
+
+CREATE TRIGGER tweets_fts_ad AFTER DELETE ON tweets BEGIN
+    INSERT INTO tweets_fts(tweets_fts, rowid, user_name, text)
+        VALUES ('delete', old.id, old.user_name, old.text);
+END;
+
+CREATE TRIGGER tweets_fts_au AFTER UPDATE OF user_name, text ON tweets BEGIN
+    INSERT INTO tweets_fts(tweets_fts, rowid, user_name, text)
+        VALUES ('delete', old.id, old.user_name, old.text);
+    INSERT INTO tweets_fts(rowid, user_name, text) VALUES (new.id, new.user_name, new.text);
+END;
+
+-- Index tweets that already exist
+INSERT INTO tweets_fts(tweets_fts) VALUES ('rebuild');
@@ -6,16 +6,100 @@ Generic database migration framework.
 import os
 import sqlite3
 import sys
-import json
-import shutil
 import glob
-from typing import List, Tuple
+import re
+from typing import List
+
+# Add the src directory to the path so we can import the package
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from iftttwh.config import load_config
+from iftttwh.db_utils import optimize_and_close, tune_connection
+
+# Transaction control inside migration scripts; the manager owns the transaction
+TRANSACTION_CONTROL_RE = re.compile(r'^(BEGIN|COMMIT|END|ROLLBACK|SAVEPOINT|RELEASE)\b', re.IGNORECASE)
+BEGIN_RE = re.compile(r'^BEGIN(\s+(DEFERRED|IMMEDIATE|EXCLUSIVE))?(\s+TRANSACTION)?\s*;?$', re.IGNORECASE)
+COMMIT_RE = re.compile(r'^(COMMIT|END)(\s+TRANSACTION)?\s*;?$', re.IGNORECASE)
+
+def strip_leading_comments(sql: str) -> str:
+    """Return sql without the whitespace and comments before its first token."""
+    while True:
+        sql = sql.lstrip()
+        if sql.startswith('--'):
+            newline = sql.find('\n')
+            sql = '' if newline < 0 else sql[newline + 1:]
+        elif sql.startswith('/*'):
+            close = sql.find('*/')
+            sql = '' if close < 0 else sql[close + 2:]
+        else:
+            return sql
+
+def split_statements(script: str) -> List[str]:
+    """Split a SQL script into complete statements, executed as written.
+    
+    A script may wrap its statements in one BEGIN ... COMMIT pair, which is
+    dropped so the statements join the manager's transaction. Any other
+    transaction control raises ValueError instead of being rewritten.
+    """
+    statements = []
+    statement = ''
+    parts = script.split(';')
+    for i, part in enumerate(parts):
+        statement += part
+        if i + 1 < len(parts):
+            statement += ';'
+            # A ';' inside a literal, comment or trigger body does not end it
+            if not sqlite3.complete_statement(statement):
+                continue
+        if strip_leading_comments(statement).rstrip(';').strip():
+            statements.append(statement)
+        statement = ''
+    
+    keywords = [strip_leading_comments(stmt).strip() for stmt in statements]
+    begins = [i for i, k in enumerate(keywords) if BEGIN_RE.match(k)]
+    if begins and COMMIT_RE.match(keywords[-1]):
+        # Drop the single outer BEGIN ... COMMIT wrapper
+        del statements[-1], keywords[-1]
+        del statements[begins[0]], keywords[begins[0]]
+    for keyword in keywords:
+        if TRANSACTION_CONTROL_RE.match(keyword):
+            raise ValueError(f"Unsupported transaction control in migration: {keyword}")
+    return statements
 
 class MigrationManager:
     def __init__(self, db_path: str, migrations_dir: str = "migrations"):
         self.db_path = db_path
         self.migrations_dir = migrations_dir
         self.migration_table = "applied_migrations"
+        self._conn = None
+        
+    def _connect(self) -> sqlite3.Connection:
+        """Open a tuned connection to the managed database."""
+        is_new = not os.path.exists(self.db_path)
+        # Transactions are managed explicitly so a whole run commits once
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        if is_new:
+            # page_size only takes effect before the first table is created
+            conn.execute('PRAGMA page_size=8192')
+        conn.execute('PRAGMA journal_size_limit=67108864')
+        return tune_connection(conn)
+        
+    def _get_connection(self) -> sqlite3.Connection:
+        """Return the cached connection, opening it on first use."""
+        if self._conn is None:
+            self._conn = self._connect()
+        return self._conn
+        
+    def close(self):
+        """Close the cached connection if it is open."""
+        if self._conn is not None:
+            optimize_and_close(self._conn)
+            self._conn = None
+        
+    def _rollback(self):
+        """Roll back the open transaction on the cached connection, if any."""
+        if self._conn is not None and self._conn.in_transaction:
+            self._conn.execute('ROLLBACK')
         
     def init_migration_tracking(self):
         """Initialize the migration tracking table if it doesn't exist."""
@@ -23,7 +107,7 @@ class MigrationManager:
             return
             
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._get_connection()
             cursor = conn.cursor()
             
             # Create migration tracking table
@@ -36,7 +120,6 @@ class MigrationManager:
             ''')
             
             conn.commit()
-            conn.close()
         except Exception as e:
             print(f"Error initializing migration tracking: {e}")
             
@@ -46,7 +129,7 @@ class MigrationManager:
             return []
             
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._get_connection()
             cursor = conn.cursor()
             
             # Check if migration tracking table exists
@@ -55,12 +138,10 @@ class MigrationManager:
             table_exists = cursor.fetchone()
             
             if not table_exists:
-                conn.close()
                 return []
                 
             cursor.execute(f'SELECT migration_name FROM {self.migration_table} ORDER BY id')
             migrations = [row[0] for row in cursor.fetchall()]
-            conn.close()
             return migrations
         except Exception as e:
             print(f"Error getting applied migrations: {e}")
@@ -79,7 +160,7 @@ class MigrationManager:
     def get_pending_migrations(self) -> List[str]:
         """Get list of migrations that haven't been applied yet."""
         all_migrations = self.get_all_migrations()
-        applied_migrations = self.get_applied_migrations()
+        applied_migrations = set(self.get_applied_migrations())
         return [m for m in all_migrations if m not in applied_migrations]
         
     def create_backup(self, migration_name: str) -> bool:
@@ -95,7 +176,16 @@ class MigrationManager:
             backup_path = f"{self.db_path.rsplit('.', 1)[0]}_{migration_name_no_ext}.db"
                 
             print(f"Creating backup of database to {backup_path}...")
-            shutil.copy2(self.db_path, backup_path)
+            # The online backup API copies a consistent snapshot of the last
+            # committed state, including pages still in the WAL, and steps
+            # through the database so writers are not locked out for long
+            src = sqlite3.connect(self.db_path)
+            dst = sqlite3.connect(backup_path)
+            try:
+                src.backup(dst, pages=1024)
+            finally:
+                dst.close()
+                src.close()
             print("Backup created successfully!")
             return True
         except Exception as e:
@@ -103,20 +193,18 @@ class MigrationManager:
             return False
             
     def mark_migration_applied(self, migration_name: str):
-        """Mark a migration as applied in the tracking table."""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute(f'''
-                INSERT OR IGNORE INTO {self.migration_table} (migration_name) 
-                VALUES (?)
-            ''', (migration_name,))
-            
-            conn.commit()
-            conn.close()
-        except Exception as e:
-            print(f"Error marking migration as applied: {e}")
+        """Mark a migration as applied in the tracking table.
+        
+        Errors propagate so the migration's transaction is rolled back rather
+        than committed without being recorded.
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute(f'''
+            INSERT OR IGNORE INTO {self.migration_table} (migration_name) 
+            VALUES (?)
+        ''', (migration_name,))
             
     def apply_migration(self, migration_name: str) -> bool:
         """Apply a specific migration file."""
@@ -126,8 +214,9 @@ class MigrationManager:
             print(f"Migration file {migration_path} does not exist.")
             return False
             
+        own_transaction = False
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._get_connection()
             cursor = conn.cursor()
             
             print(f"Applying migration {migration_name}...")
@@ -136,69 +225,80 @@ class MigrationManager:
             with open(migration_path, 'r') as f:
                 migration_sql = f.read()
                 
-            cursor.executescript(migration_sql)
+            # Join the run's transaction, or open one for a standalone call
+            own_transaction = not conn.in_transaction
+            if own_transaction:
+                cursor.execute('BEGIN IMMEDIATE')
+                
+            for statement in split_statements(migration_sql):
+                cursor.execute(statement)
             
             # Mark migration as applied
             self.mark_migration_applied(migration_name)
             
-            print("Migration applied successfully!")
-            
-            conn.commit()
-            conn.close()
+            # Inside a run, success is reported once the run commits
+            if own_transaction:
+                cursor.execute('COMMIT')
+                print("Migration applied successfully!")
             return True
             
         except Exception as e:
             print(f"Error applying migration {migration_name}: {e}")
+            if own_transaction:
+                self._rollback()
             return False
             
     def apply_all_pending(self) -> bool:
         """Apply all pending migrations."""
-        # Initialize migration tracking
-        self.init_migration_tracking()
+        try:
+            # Initialize migration tracking
+            self.init_migration_tracking()
         
-        # Check if database exists
-        if not os.path.exists(self.db_path):
-            print(f"Database file {self.db_path} does not exist.")
-            # This is fine - it will be created when first migration runs
+            # Check if database exists
+            if not os.path.exists(self.db_path):
+                print(f"Database file {self.db_path} does not exist.")
+                # This is fine - it will be created when first migration runs
             
-        pending_migrations = self.get_pending_migrations()
+            pending_migrations = self.get_pending_migrations()
         
-        if not pending_migrations:
-            print("No migrations pending. Database is up to date.")
-            return True
+            if not pending_migrations:
+                print("No migrations pending. Database is up to date.")
+                return True
             
-        print(f"Found {len(pending_migrations)} pending migrations:")
-        for migration in pending_migrations:
-            print(f"  - {migration}")
+            print(f"Found {len(pending_migrations)} pending migrations:")
+            for migration in pending_migrations:
+                print(f"  - {migration}")
             
-        # Apply each pending migration
-        for migration_name in pending_migrations:
-            # Create backup before applying each migration
-            if not self.create_backup(migration_name):
-                print(f"Failed to create backup for {migration_name}. Aborting migration.")
+            # All pending migrations share a single transaction, so the
+            # database file does not change until the final COMMIT and one
+            # backup taken up front covers the whole run
+            if not self.create_backup(pending_migrations[0]):
+                print(f"Failed to create backup for {pending_migrations[0]}. Aborting migration.")
                 return False
             
-            if not self.apply_migration(migration_name):
-                print(f"Failed to apply migration {migration_name}!")
+            # Apply all pending migrations in a single transaction so the run
+            # commits (and syncs) once, or rolls back as a whole
+            conn = self._get_connection()
+            conn.execute('BEGIN IMMEDIATE')
+            for migration_name in pending_migrations:
+                if not self.apply_migration(migration_name):
+                    print(f"Failed to apply migration {migration_name}!")
+                    self._rollback()
+                    return False
+                
+            try:
+                conn.execute('COMMIT')
+            except sqlite3.Error as e:
+                print(f"Error committing migrations: {e}")
+                self._rollback()
                 return False
-            else:
+            
+            for migration_name in pending_migrations:
                 print(f"Successfully applied migration {migration_name}")
-                
-        print("All migrations completed successfully!")
-        return True
-
-def load_config():
-    """Load configuration from config.json file."""
-    try:
-        with open('config/config.json', 'r') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        # Default configuration
-        return {
-            "database": {
-                "path": "data/tweets.db"
-            }
-        }
+            print("All migrations completed successfully!")
+            return True
+        finally:
+            self.close()
 
 def main():
     """Main function to run the migration."""
@@ -4,25 +4,18 @@ Script to dump tweets from SQLite database to CSV format.
 This can be used to backup tweets or reinitialize the database.
 """
 
-import sqlite3
 import csv
 import os
 import sys
-import json
-from datetime import datetime
 
-def load_config():
-    """Load configuration from config.json file."""
-    try:
-        with open("config/config.json", "r") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        # Default configuration
-        return {
-            "database": {
-                "path": "data/tweets.db"
-            }
-        }
+# Add the src directory to the path so we can import the package
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from iftttwh.config import load_config
+from iftttwh.db_utils import connect, optimize_and_close
+
+# Buffer size for the CSV file, so large dumps use fewer write() calls
+IO_BUFFER_SIZE = 1 << 20
 
 def dump_tweets_to_csv(db_path, csv_path):
     """Dump all tweets from SQLite database to CSV file."""
@@ -33,8 +26,9 @@ def dump_tweets_to_csv(db_path, csv_path):
             return False
             
         # Connect to database
-        conn = sqlite3.connect(db_path)
+        conn = connect(db_path)
         cursor = conn.cursor()
+        cursor.arraysize = 1000
         
         # Query all tweets
         cursor.execute("""
@@ -43,21 +37,28 @@ def dump_tweets_to_csv(db_path, csv_path):
             ORDER BY created_at_parsed DESC, created_at DESC
         """)
         
-        rows = cursor.fetchall()
-        conn.close()
+        count = 0
         
-        # Write to CSV
-        with open(csv_path, 'w', newline='', encoding='utf-8') as csvfile:
+        def counted(rows):
+            """Yield rows unchanged while counting them."""
+            nonlocal count
+            for row in rows:
+                count += 1
+                yield row
+        
+        # Write to CSV, streaming rows straight from the cursor
+        with open(csv_path, 'w', newline='', encoding='utf-8', buffering=IO_BUFFER_SIZE) as csvfile:
             writer = csv.writer(csvfile)
             
             # Write header
             writer.writerow(['CreatedAt', 'UserName', 'Text', 'LinkToTweet'])
             
             # Write data
-            for row in rows:
-                writer.writerow(row)
+            writer.writerows(counted(cursor))
+            
+        optimize_and_close(conn)
                 
-        print(f"Successfully dumped {len(rows)} tweets to {csv_path}")
+        print(f"Successfully dumped {count} tweets to {csv_path}")
         return True
         
     except Exception as e:
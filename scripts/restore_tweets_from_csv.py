@@ -4,84 +4,163 @@ Script to restore tweets from CSV file to SQLite database.
 This can be used to reinitialize the database from a backup.
 """
 
-import sqlite3
 import csv
 import os
 import sys
-import json
-from datetime import datetime
+import itertools
 
-def load_config():
-    """Load configuration from config.json file."""
-    try:
-        with open("config/config.json", "r") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        # Default configuration
-        return {
-            "database": {
-                "path": "data/tweets.db"
-            }
-        }
+try:
+    import pandas as pd
+except ImportError:  # pandas is optional; the csv module is used instead
+    pd = None
+
+# Add the src directory to the path so we can import the package
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from iftttwh.config import load_config
+from iftttwh.db_utils import connect, drop_secondary_indexes, optimize_and_close
+
+# Number of CSV rows inserted per transaction
+BATCH_SIZE = 5000
+
+# Number of CSV rows parsed per pandas chunk
+PANDAS_CHUNK_SIZE = 50000
+
+# Buffer size for the CSV file, so large restores use fewer read() calls
+IO_BUFFER_SIZE = 1 << 20
+
+# Shared by every batch so the prepared statement is reused from the cache
+INSERT_SQL = "INSERT OR IGNORE INTO tweets (created_at, user_name, text, link_to_tweet) VALUES (?, ?, ?, ?)"
+
+# Replaces the table-level UNIQUE constraint on freshly restored tables
+UNIQUE_INDEX_SQL = "CREATE UNIQUE INDEX IF NOT EXISTS idx_tweets_unique ON tweets(user_name, link_to_tweet, text)"
+
+# Secondary indexes on the tweets table, matching migrations/000_init.sql
+# and migrations/002_add_dump_cover_index.sql
+INDEX_SQL = (
+    "CREATE INDEX IF NOT EXISTS idx_tweets_created_at_parsed ON tweets(created_at_parsed)",
+    "CREATE INDEX IF NOT EXISTS idx_tweets_user_name ON tweets(user_name)",
+    "CREATE INDEX IF NOT EXISTS idx_tweets_text ON tweets(text)",
+    "CREATE INDEX IF NOT EXISTS idx_tweets_link_to_tweet ON tweets(link_to_tweet)",
+    "CREATE INDEX IF NOT EXISTS idx_tweets_created_at ON tweets(created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_tweets_dump_cover ON tweets(created_at_parsed DESC, created_at DESC, user_name, text, link_to_tweet)",
+)
+
+def unique_rows(rows):
+    """Yield CSV rows, skipping repeats of (user_name, link_to_tweet, text)."""
+    seen = set()
+    for row in rows:
+        # Key on the fields themselves; distinct rows whose hashes collided
+        # would otherwise be dropped
+        key = (row[1], row[3], row[2])
+        if key not in seen:
+            seen.add(key)
+            yield row
+
+def read_csv_rows(csvfile):
+    """Yield (created_at, user_name, text, link_to_tweet) rows, skipping the header.
+
+    Uses pandas when it is installed, otherwise csv.reader. Either way rows
+    with fewer than 4 fields are skipped and extra fields are ignored.
+    """
+    if pd is not None:
+        # The python engine leaves missing fields as None rather than '', so
+        # short rows can be told apart from rows with empty trailing fields.
+        # Extra fields are dropped by usecols, or by on_bad_lines on pandas
+        # versions that report them as bad lines.
+        chunks = pd.read_csv(csvfile, engine="python", header=None, skiprows=1,
+                             names=range(4), usecols=range(4), dtype=str,
+                             keep_default_na=False, on_bad_lines=lambda fields: fields[:4],
+                             chunksize=PANDAS_CHUNK_SIZE)
+        for chunk in chunks:
+            for row in chunk.itertuples(index=False, name=None):
+                if row[3] is not None:
+                    yield row
+        return
+        
+    reader = csv.reader(csvfile)
+    
+    # Skip header
+    next(reader, None)
+    
+    for row in reader:
+        if len(row) >= 4:
+            yield row[:4]
+
+def build_indexes(cursor, is_new_table, dropped_index_sql):
+    """Build the tweets indexes in one transaction after loading rows."""
+    cursor.execute("BEGIN")
+    if is_new_table:
+        cursor.execute(UNIQUE_INDEX_SQL)
+    for sql in dropped_index_sql:
+        cursor.execute(sql)
+    for sql in INDEX_SQL:
+        cursor.execute(sql)
+    cursor.execute("COMMIT")
 
 def restore_tweets_from_csv(csv_path, db_path):
     """Restore tweets from CSV file to SQLite database."""
+    conn = None
+    is_new_table = False
+    dropped_index_sql = []
+    indexes_built = False
     try:
         # Check if CSV file exists
         if not os.path.exists(csv_path):
             print(f"CSV file {csv_path} does not exist.")
             return False
             
-        # Connect to database
-        conn = sqlite3.connect(db_path)
+        # Connect to database; transactions are managed explicitly below
+        conn = connect(db_path, isolation_level=None, cached_statements=256)
         cursor = conn.cursor()
         
-        # Create table if it doesn't exist
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS tweets (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_name TEXT,
-                link_to_tweet TEXT,
-                created_at TEXT,
-                created_at_parsed TIMESTAMP,
-                text TEXT,
-                received_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(user_name, link_to_tweet, text)
-            )
-        """)
+        # Check whether we are restoring into a fresh table
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='tweets'")
+        is_new_table = cursor.fetchone() is None
         
-        # Create indexes
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_tweets_created_at_parsed ON tweets(created_at_parsed)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_tweets_user_name ON tweets(user_name)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_tweets_text ON tweets(text)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_tweets_link_to_tweet ON tweets(link_to_tweet)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_tweets_created_at ON tweets(created_at)")
+        if is_new_table:
+            # Create the table without the UNIQUE constraint; duplicates are
+            # filtered in Python and the unique index is built after loading
+            cursor.execute("""
+                CREATE TABLE tweets (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_name TEXT,
+                    link_to_tweet TEXT,
+                    created_at TEXT,
+                    created_at_parsed TIMESTAMP,
+                    text TEXT,
+                    received_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+        else:
+            # Drop the secondary indexes while appending and rebuild them
+            # afterwards; unique indexes stay so INSERT OR IGNORE still dedups
+            dropped_index_sql = drop_secondary_indexes(cursor, "tweets")
         
         count = 0
         
         # Read from CSV
-        with open(csv_path, 'r', newline='', encoding='utf-8') as csvfile:
-            reader = csv.reader(csvfile)
-            
-            # Skip header
-            next(reader, None)
-            
-            # Insert data
-            for row in reader:
-                if len(row) >= 4:
-                    try:
-                        cursor.execute("""
-                            INSERT OR IGNORE INTO tweets 
-                            (created_at, user_name, text, link_to_tweet)
-                            VALUES (?, ?, ?, ?)
-                        """, (row[0], row[1], row[2], row[3]))
-                        count += 1
-                    except sqlite3.IntegrityError:
-                        # Skip duplicates
-                        pass
-                        
-        conn.commit()
-        conn.close()
+        with open(csv_path, 'r', newline='', encoding='utf-8', buffering=IO_BUFFER_SIZE) as csvfile:
+            # Insert data in batches, one transaction per batch.
+            # INSERT OR IGNORE skips duplicate rows already in the table.
+            rows = read_csv_rows(csvfile)
+            if is_new_table:
+                rows = unique_rows(rows)
+            while True:
+                batch = list(itertools.islice(rows, BATCH_SIZE))
+                if not batch:
+                    break
+                cursor.execute("BEGIN")
+                cursor.executemany(INSERT_SQL, batch)
+                count += cursor.rowcount
+                cursor.execute("COMMIT")
+        
+        # Build the indexes in one pass now that the rows are loaded
+        build_indexes(cursor, is_new_table, dropped_index_sql)
+        indexes_built = True
+
+        optimize_and_close(conn)
+        conn = None
         
         print(f"Successfully restored {count} tweets from {csv_path} to {db_path}")
         return True
@@ -89,6 +168,18 @@ def restore_tweets_from_csv(csv_path, db_path):
     except Exception as e:
         print(f"Error restoring tweets from CSV: {e}")
         return False
+    finally:
+        if conn is not None:
+            # Roll back the failed batch, then put the indexes back so a
+            # failed restore does not leave the table without them
+            try:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                if not indexes_built:
+                    build_indexes(conn.cursor(), is_new_table, dropped_index_sql)
+            except Exception as e:
+                print(f"Error rebuilding indexes: {e}")
+            conn.close()
 
 def main():
     """Main function to run the restore script."""
@@ -1,192 +1,348 @@
 from flask import Flask, request, jsonify
-import json
-import hashlib
+from flask.json.provider import JSONProvider
+import binascii
 import hmac
 import os
 from datetime import datetime
 import logging
+import logging.handlers
 import sqlite3
-import re
-from dateutil import parser as date_parser
+import atexit
+import collections
 import csv
-import os.path
-
-# Import required libraries for ChromaDB (now a prerequisite)
-import chromadb
-from chromadb import Documents, EmbeddingFunction, Embeddings
-import requests
-import json
-
-
-# Custom embedding function for local Hugging Face server
-class LocalHuggingFaceEmbeddingFunction(EmbeddingFunction):
-    def __init__(self, server_url="http://huggingface-embeddings:80"):
-        self.server_url = server_url.rstrip("/")
-
-    def __call__(self, input: Documents) -> Embeddings:
-        """Generate embeddings for the given documents using local Hugging Face server."""
-        try:
-            # Prepare the request payload
-            payload = {"inputs": input}
-
-            # Make request to the local server
-            response = requests.post(
-                f"{self.server_url}/embed",
-                json=payload,
-                headers={"Content-Type": "application/json"},
-            )
+import functools
+import itertools
+import queue
+import threading
+import time
 
-            if response.status_code == 200:
-                embeddings = response.json()
-                # Ensure we return a list of lists (embeddings for each document)
-                if isinstance(embeddings, list) and len(embeddings) > 0:
-                    # If it's a list of embeddings, return as is
-                    if isinstance(embeddings[0], list):
-                        return embeddings
-                    # If it's a single embedding, wrap it in a list
-                    else:
-                        return [embeddings]
-                else:
-                    raise ValueError(
-                        f"Unexpected response format from server: {embeddings}"
-                    )
-            else:
-                raise Exception(
-                    f"Server returned status code {response.status_code}: {response.text}"
-                )
+import orjson
 
-        except Exception as e:
-            print(f"Failed to get embeddings from local Hugging Face server: {e}")
-            raise  # Initialize ChromaDB client (now a prerequisite)
+from iftttwh.config import load_config
+from iftttwh.db_utils import connect, drop_secondary_indexes
 
 
-CHROMA_CLIENT = chromadb.PersistentClient(path="data/chroma_db")
-# Allow overriding embeddings server URL via env; default to docker service name
-HF_EMBEDDINGS_URL = os.environ.get(
-    "HF_EMBEDDINGS_URL", "http://huggingface-embeddings:80"
-)
-LOCAL_HF_EF = LocalHuggingFaceEmbeddingFunction(server_url=HF_EMBEDDINGS_URL)
+config = load_config()
 
-# Try to get or create collection, handling embedding function conflicts
-try:
-    CHROMA_COLLECTION = CHROMA_CLIENT.get_or_create_collection(
-        name="tweets", embedding_function=LOCAL_HF_EF
-    )
-except ValueError as e:
-    if "embedding function already exists" in str(e):
-        print(
-            "Embedding function conflict detected. Recreating collection with new embedding function..."
-        )
-        # Delete the existing collection
-        try:
-            CHROMA_CLIENT.delete_collection(name="tweets")
-            print("Deleted existing collection")
-        except Exception as delete_e:
-            print(f"Failed to delete existing collection: {delete_e}")
-
-        # Create new collection with the local Hugging Face embedding function
-        CHROMA_COLLECTION = CHROMA_CLIENT.create_collection(
-            name="tweets", embedding_function=LOCAL_HF_EF
-        )
-        print("Created new collection with local Hugging Face embedding function")
-    else:
-        raise
+# Make sure the log directories exist before the file handlers open them
+for _log_file in (config["logging"]["file"], config["debug_logging"]["payload_log_file"]):
+    os.makedirs(os.path.dirname(_log_file) or ".", exist_ok=True)
 
-CHROMADB_ENABLED = True
 
+class DrainFlushFileHandler(logging.FileHandler):
+    """FileHandler that flushes once its log queue is drained, not after every record.
 
-# Load configuration
-def load_config():
-    """Load configuration from config.json file."""
-    try:
-        with open("config/config.json", "r") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        # Default configuration for Twitter webhook
-        return {
-            "server": {"host": "0.0.0.0", "port": 5000, "debug": False},
-            "security": {
-                "secret_key": os.environ.get("WEBHOOK_SECRET", "default_secret_key"),
-                "require_signature": False,
-            },
-            "logging": {"level": "INFO", "file": "logs/app.log"},
-            "database": {
-                "path": "data/tweets.db",
-                "csv_path": "data/Tweets - Sheet1.csv",
-            },
-            "debug_logging": {"payload_log_file": "logs/payload.log"},
-        }
+    A burst of queued records reaches the file in buffered writes; a lone
+    record is still flushed straight away.
+    """
 
+    def __init__(self, filename, log_queue):
+        super().__init__(filename)
+        self.log_queue = log_queue
+
+    def flush(self):
+        if self.log_queue.empty():
+            super().flush()
+
+
+def _queue_log_handler(log_queue, *handlers):
+    """Return a QueueHandler whose records are written by handlers on a listener thread.
+
+    Request threads only enqueue records; file and console writes happen
+    on the listener, which is stopped (and drained) at exit.
+    """
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    handler = logging.handlers.QueueHandler(log_queue)
+    # Leave the layout to the listener's handlers
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    return handler
 
-config = load_config()
 
 # Configure logging
 log_level = getattr(logging, config["logging"]["level"].upper(), logging.INFO)
-logging.basicConfig(
-    level=log_level,
-    format="%(asctime)s %(levelname)s %(message)s",
-    handlers=[logging.FileHandler(config["logging"]["file"]), logging.StreamHandler()],
-)
+log_formatter = logging.Formatter("%(asctime)s %(levelname)s %(message)s")
+_log_queue = queue.Queue()
+log_handlers = [
+    DrainFlushFileHandler(config["logging"]["file"], _log_queue),
+    logging.StreamHandler(),
+]
+for _handler in log_handlers:
+    _handler.setFormatter(log_formatter)
+logging.basicConfig(level=log_level, handlers=[_queue_log_handler(_log_queue, *log_handlers)])
 logger = logging.getLogger(__name__)
 
 # Configure payload debug logging
 payload_logger = logging.getLogger("payload_debug")
 payload_logger.setLevel(logging.DEBUG)
-payload_log_handler = logging.FileHandler(config["debug_logging"]["payload_log_file"])
+_payload_log_queue = queue.Queue()
+payload_log_handler = DrainFlushFileHandler(
+    config["debug_logging"]["payload_log_file"], _payload_log_queue
+)
 payload_log_handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
-payload_logger.addHandler(payload_log_handler)
+payload_logger.addHandler(_queue_log_handler(_payload_log_queue, payload_log_handler))
 payload_logger.propagate = False  # Don't propagate to other loggers
 
-# Initialize ChromaDB client and collection
-CHROMA_CLIENT = chromadb.PersistentClient(path="data/chroma_db")
+# ChromaDB is opened on first use, see get_chroma_collection()
+CHROMA_PATH = "data/chroma_db"
 # Allow overriding embeddings server URL via env; default to docker service name
 HF_EMBEDDINGS_URL = os.environ.get(
     "HF_EMBEDDINGS_URL", "http://huggingface-embeddings:80"
 )
-LOCAL_HF_EF = LocalHuggingFaceEmbeddingFunction(server_url=HF_EMBEDDINGS_URL)
+# HNSW index settings for a newly created tweets collection. Chroma reads
+# them when it loads the index, so an existing collection keeps the
+# settings it was created with.
+CHROMA_HNSW_METADATA = {
+    "hnsw:space": "cosine",
+    "hnsw:M": 32,
+    "hnsw:construction_ef": 200,
+    "hnsw:search_ef": 80,
+}
+_chroma_collection = None
+_chroma_collection_lock = threading.Lock()
 
-# Try to get or create collection, handling embedding function conflicts
-try:
-    CHROMA_COLLECTION = CHROMA_CLIENT.get_or_create_collection(
-        name="tweets", embedding_function=LOCAL_HF_EF
-    )
-except ValueError as e:
-    if "embedding function already exists" in str(e):
-        logger.info(
-            "Embedding function conflict detected. Recreating collection with new embedding function..."
-        )
-        # Delete the existing collection
-        try:
-            CHROMA_CLIENT.delete_collection(name="tweets")
-            logger.info("Deleted existing collection")
-        except Exception as delete_e:
-            logger.warning(f"Failed to delete existing collection: {delete_e}")
-
-        # Create new collection with the local Hugging Face embedding function
-        CHROMA_COLLECTION = CHROMA_CLIENT.create_collection(
-            name="tweets", embedding_function=LOCAL_HF_EF
+CHROMADB_ENABLED = True
+
+class ORJSONProvider(JSONProvider):
+    """Flask JSON provider that encodes and decodes with orjson."""
+
+    option = orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=self.option).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Hand orjson's bytes straight to the response, skipping the
+        # decode to str and re-encode that dumps() would need
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, option=self.option), mimetype="application/json"
         )
-        logger.info("Created new collection with local Hugging Face embedding function")
-    else:
-        raise
 
-CHROMADB_ENABLED = True
 
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
+# IFTTT payloads are a few hundred bytes; larger bodies are rejected with
+# 413 before they are read into memory
+app.config["MAX_CONTENT_LENGTH"] = 64 * 1024
 
 # Get secret key from config or environment variables
 SECRET_KEY = config["security"]["secret_key"]
+SECRET_KEY_BYTES = SECRET_KEY.encode("utf-8")
 REQUIRE_SIGNATURE = config["security"]["require_signature"]
 DB_PATH = config["database"]["path"]
 CSV_PATH = config["database"]["csv_path"]
 
+# Buffer size for the startup CSV, so large files use fewer read() calls
+CSV_IO_BUFFER_SIZE = 1 << 20
+
+# X-Signature header format: "sha256=" followed by the hex HMAC-SHA256 digest
+SIGNATURE_PREFIX = "sha256="
+SIGNATURE_PREFIX_LEN = len(SIGNATURE_PREFIX)
+SIGNATURE_DIGEST_SIZE = 32  # Bytes in a SHA-256 digest
+
+# Search prefix that filters by user name instead of tweet text
+FROM_PREFIX = "from:"
+FROM_PREFIX_LEN = len(FROM_PREFIX)
+
+# Shortest query the trigram tokenizer of tweets_fts can match
+FTS_MIN_QUERY_LENGTH = 3
+
+# SQL statements, built once so the connection's statement cache is reused
+_TWEET_COLUMNS = "id, user_name, link_to_tweet, created_at, created_at_parsed, text, received_at"
+_LATEST_ORDER = "ORDER BY created_at_parsed DESC, created_at DESC LIMIT :limit"
+LATEST_TWEETS_SQL = f"SELECT {_TWEET_COLUMNS} FROM tweets {_LATEST_ORDER}"
+SEARCH_FTS_SQL = (
+    f"SELECT {_TWEET_COLUMNS} FROM tweets"
+    " WHERE id IN (SELECT rowid FROM tweets_fts WHERE tweets_fts MATCH :q)"
+    f" {_LATEST_ORDER}"
+)
+SEARCH_LIKE_SQL = {
+    column: f"SELECT {_TWEET_COLUMNS} FROM tweets WHERE {column} LIKE :q {_LATEST_ORDER}"
+    for column in ("user_name", "text")
+}
+_INSERT_TWEET_COLUMNS = "tweets (user_name, link_to_tweet, created_at, created_at_parsed, text)"
+# Only uniqueness conflicts are skipped; other constraint failures still raise
+INSERT_TWEET_SQL = (
+    f"INSERT INTO {_INSERT_TWEET_COLUMNS} VALUES (?, ?, ?, ?, ?) ON CONFLICT DO NOTHING"
+)
+INSERT_CSV_ROW_SQL = f"INSERT OR IGNORE INTO {_INSERT_TWEET_COLUMNS} VALUES (?, ?, ?, ?, ?)"
+CHROMA_BACKFILL_SQL = (
+    "SELECT id, user_name, link_to_tweet, created_at, created_at_parsed, text"
+    " FROM tweets WHERE id > ? ORDER BY id ASC"
+)
+
+# Recent latest/search/semantic-search results, reused for identical requests
+# within the TTL and cleared whenever tweets are written
+QUERY_CACHE_TTL = 5.0  # Seconds
+QUERY_CACHE_SIZE = 256
+_query_cache = collections.OrderedDict()
+_query_cache_lock = threading.Lock()
+
+# Tweets waiting to be added to ChromaDB by the background worker
+CHROMA_BATCH_SIZE = 32  # Match Hugging Face server batch size limit
+CHROMA_FLUSH_INTERVAL = 0.25  # Seconds to wait for a batch to fill
+# Set chromadb.async_add to false to add each tweet before the webhook returns
+CHROMA_ASYNC_ADD = config.get("chromadb", {}).get("async_add", True)
+CHROMA_SORT_WINDOW = CHROMA_BATCH_SIZE * 16  # Rows sorted by length when backfilling
+_chroma_queue = queue.Queue()
+_chroma_worker = None
+_chroma_worker_lock = threading.Lock()
+
+
+# Per-thread SQLite connection reused across requests handled by that thread
+_db_local = threading.local()
 
+
+def get_chroma_collection():
+    """Return the ChromaDB tweets collection, opening the client on first use.
+
+    chromadb and the embedding function are imported here so processes that
+    never touch ChromaDB do not pay for loading them.
+    """
+    global _chroma_collection
+    if _chroma_collection is not None:
+        return _chroma_collection
+
+    with _chroma_collection_lock:
+        if _chroma_collection is None:
+            import chromadb
+            from iftttwh.embeddings import LocalHuggingFaceEmbeddingFunction
+
+            client = chromadb.PersistentClient(path=CHROMA_PATH)
+            embedding_function = LocalHuggingFaceEmbeddingFunction(
+                server_url=HF_EMBEDDINGS_URL
+            )
+
+            # Only pass the HNSW settings when creating the collection; on an
+            # existing one they would overwrite the metadata its index was
+            # built with
+            exists = any(c.name == "tweets" for c in client.list_collections())
+            metadata = None if exists else CHROMA_HNSW_METADATA
+
+            # Try to get or create collection, handling embedding function conflicts
+            try:
+                collection = client.get_or_create_collection(
+                    name="tweets", embedding_function=embedding_function, metadata=metadata
+                )
+            except ValueError as e:
+                if "embedding function already exists" not in str(e):
+                    raise
+                logger.info(
+                    "Embedding function conflict detected. Recreating collection with new embedding function..."
+                )
+                # Delete the existing collection
+                try:
+                    client.delete_collection(name="tweets")
+                    logger.info("Deleted existing collection")
+                except Exception as delete_e:
+                    logger.warning(f"Failed to delete existing collection: {delete_e}")
+
+                # Create new collection with the local Hugging Face embedding function
+                collection = client.create_collection(
+                    name="tweets",
+                    embedding_function=embedding_function,
+                    metadata=CHROMA_HNSW_METADATA,
+                )
+                logger.info(
+                    "Created new collection with local Hugging Face embedding function"
+                )
+                exists = False
+
+            if not exists:
+                # A new collection is empty, so any recorded high-water mark
+                # (e.g. from a deleted data/chroma_db) no longer holds
+                try:
+                    reset_chroma_high_water_mark(get_db())
+                except Exception as e:
+                    logger.error("Failed to reset ChromaDB high-water mark: %s", e)
+            _chroma_collection = collection
+    return _chroma_collection
+
+
+def get_db():
+    """Return this thread's SQLite connection, opening it on first use."""
+    conn = getattr(_db_local, "conn", None)
+    if conn is None:
+        conn = connect(DB_PATH, cached_statements=256)
+        # Rows can be read by column name or converted with dict(row)
+        conn.row_factory = sqlite3.Row
+        _db_local.conn = conn
+    return conn
+
+
+# Format IFTTT uses for CreatedAt, e.g. "September 08, 2025 at 02:39PM"
+CREATED_AT_FORMAT = "%B %d, %Y at %I:%M%p"
+
+_MONTHS = {
+    name: number
+    for number, name in enumerate(
+        (
+            "January",
+            "February",
+            "March",
+            "April",
+            "May",
+            "June",
+            "July",
+            "August",
+            "September",
+            "October",
+            "November",
+            "December",
+        ),
+        start=1,
+    )
+}
+
+
+def _parse_ifttt_created_at(created_at_str):
+    """Parse "September 08, 2025 at 02:39PM" by fixed offsets after the month name.
+
+    Raises KeyError or ValueError for anything not in exactly that shape.
+    """
+    month_name, _, rest = created_at_str.partition(" ")
+    month = _MONTHS[month_name]
+    # rest is "08, 2025 at 02:39PM"
+    if len(rest) != 19 or rest[2:4] != ", " or rest[8:12] != " at " or rest[14] != ":":
+        raise ValueError(created_at_str)
+    hour = int(rest[12:14])
+    meridiem = rest[17:]
+    if meridiem not in ("AM", "PM") or not 1 <= hour <= 12:
+        raise ValueError(created_at_str)
+    if meridiem == "PM":
+        hour = hour % 12 + 12
+    else:
+        hour %= 12
+    return datetime(int(rest[4:8]), month, int(rest[0:2]), hour, int(rest[15:17])).isoformat()
+
+
+@functools.lru_cache(maxsize=4096)
 def parse_created_at(created_at_str):
     """Parse the CreatedAt field from IFTTT into a datetime object."""
     if not created_at_str or created_at_str == "":
         return None
 
+    # Fast paths for the known IFTTT format
+    try:
+        return _parse_ifttt_created_at(created_at_str)
+    except (KeyError, ValueError):
+        pass
+
     try:
+        return datetime.strptime(created_at_str, CREATED_AT_FORMAT).isoformat()
+    except ValueError:
+        pass
+
+    try:
+        # dateutil is only needed for formats the fast paths reject, so it
+        # is imported on first use rather than at startup
+        from dateutil import parser as date_parser
+
         # Handle the format: "September 08, 2025 at 02:39PM"
         # We need to replace " at " with " " to make it parseable
         formatted_str = created_at_str.replace(" at ", " ")
@@ -202,7 +358,6 @@ def init_db():
     try:
         # Import and run the migration system
         import sys
-        import os
 
         sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
         from migrations.apply_migration import MigrationManager
@@ -215,9 +370,7 @@ def init_db():
             # Load data from CSV if it exists
             if os.path.exists(CSV_PATH):
                 logger.info(f"Loading initial data from {CSV_PATH}")
-                conn = sqlite3.connect(DB_PATH)
-                load_csv_data(conn, CSV_PATH)
-                conn.close()
+                load_csv_data(get_db(), CSV_PATH)
             else:
                 logger.info("No CSV file found, skipping CSV load")
 
@@ -238,70 +391,170 @@ def load_csv_data(conn, csv_path):
     """
     try:
         c = conn.cursor()
-        with open(csv_path, "r", encoding="utf-8") as csvfile:
+        # All batches share one transaction, committed or rolled back by the
+        # connection context manager. BEGIN IMMEDIATE takes the write lock up
+        # front so the load cannot fail with SQLITE_BUSY partway through.
+        with conn, open(
+            csv_path, "r", encoding="utf-8", newline="", buffering=CSV_IO_BUFFER_SIZE
+        ) as csvfile:
+            conn.execute("BEGIN IMMEDIATE")
+            # Into an empty table, build the secondary indexes and the FTS
+            # index once after loading instead of updating them row by row
+            is_empty = c.execute("SELECT 1 FROM tweets LIMIT 1").fetchone() is None
+            deferred_sql = _defer_tweets_indexes(c) if is_empty else []
             reader = csv.reader(csvfile)
 
             # Skip header row
             next(reader, None)
 
-            count = 0
-            for row in reader:
-                # Skip empty rows
-                if not row or len(row) < 4:
-                    continue
-
-                # Extract fields in the expected order:
-                # CreatedAt, UserName, Text, LinkToTweet
-                created_at = row[0] if len(row) > 0 else ""
-                user_name = row[1] if len(row) > 1 else ""
-                text = row[2] if len(row) > 2 else ""
-                link_to_tweet = row[3] if len(row) > 3 else ""
+            # Skip empty rows
+            rows = (row for row in reader if row and len(row) >= 4)
 
-                # Parse the CreatedAt field
-                created_at_parsed = parse_created_at(created_at)
+            # One executemany pulls parsed rows straight from the reader
+            count = _insert_csv_rows(c, _iter_csv_tuples(rows))
 
-                try:
-                    c.execute(
-                        """INSERT INTO tweets
-                                 (user_name, link_to_tweet, created_at, created_at_parsed, text)
-                                 VALUES (?, ?, ?, ?, ?)""",
-                        (user_name, link_to_tweet, created_at, created_at_parsed, text),
-                    )
-                    count += 1
-                except sqlite3.IntegrityError:
-                    # Duplicate found in CSV, skip it
-                    logger.debug(
-                        f"Skipping duplicate tweet from CSV: {user_name}, {text[:50]}..."
-                    )
-                    continue
+            for sql in deferred_sql:
+                c.execute(sql)
 
-        conn.commit()
+        clear_query_cache()
         logger.info(f"Loaded {count} records from {csv_path}")
     except Exception as e:
         logger.error(f"Failed to load CSV data: {e}")
 
 
+def _defer_tweets_indexes(cursor):
+    """Drop the tweets secondary indexes and FTS sync triggers ahead of a bulk load.
+
+    Returns the statements that recreate them and rebuild tweets_fts.
+    """
+    deferred_sql = drop_secondary_indexes(cursor, "tweets")
+    cursor.execute("SELECT name, sql FROM sqlite_master WHERE type='trigger' AND tbl_name='tweets'")
+    triggers = cursor.fetchall()
+    for name, sql in triggers:
+        cursor.execute(f'DROP TRIGGER "{name}"')
+        deferred_sql.append(sql)
+    if triggers:
+        deferred_sql.append("INSERT INTO tweets_fts(tweets_fts) VALUES ('rebuild')")
+    return deferred_sql
+
+
+def _iter_csv_tuples(rows):
+    """Yield tweets table tuples for raw CSV rows, parsing CreatedAt."""
+    for row in rows:
+        # Extract fields in the expected order:
+        # CreatedAt, UserName, Text, LinkToTweet
+        created_at, user_name, text, link_to_tweet = row[:4]
+        yield (user_name, link_to_tweet, created_at, parse_created_at(created_at), text)
+
+
+def _insert_csv_rows(cursor, rows):
+    """Insert parsed CSV rows, skipping duplicates; returns rows inserted."""
+    cursor.executemany(INSERT_CSV_ROW_SQL, rows)
+    return cursor.rowcount
+
+
+def _add_chroma_batch(batch):
+    """Add a batch of (id, document, metadata) tuples to ChromaDB.
+
+    The high-water mark is left to populate_chromadb: batches can fail or
+    arrive out of id order, so a batch added here says nothing about the ids
+    below it. A failed batch stays above the mark and is retried there.
+    """
+    ids, documents, metadatas = zip(*batch)
+    try:
+        get_chroma_collection().add(
+            documents=list(documents), metadatas=list(metadatas), ids=list(ids)
+        )
+        logger.debug("Added %d tweets to ChromaDB collection", len(ids))
+    except Exception as e:
+        logger.error("Failed to add tweets %s to ChromaDB collection: %s", ", ".join(ids), e)
+
+
+def _chroma_worker_loop():
+    """Drain the ChromaDB queue, adding up to CHROMA_BATCH_SIZE tweets at a time."""
+    while True:
+        batch = [_chroma_queue.get()]
+        # Wait briefly for more tweets so they share one embedding request
+        deadline = time.monotonic() + CHROMA_FLUSH_INTERVAL
+        while len(batch) < CHROMA_BATCH_SIZE:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(_chroma_queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+
+        _add_chroma_batch(batch)
+        for _ in batch:
+            _chroma_queue.task_done()
+
+
+def enqueue_chroma_add(tweet_id, text, metadata):
+    """Queue a tweet to be added to ChromaDB by the background worker.
+
+    When CHROMA_ASYNC_ADD is off the tweet is added before returning instead.
+    """
+    global _chroma_worker
+    if not CHROMA_ASYNC_ADD:
+        _add_chroma_batch([(str(tweet_id), text, metadata)])
+        return
+    with _chroma_worker_lock:
+        if _chroma_worker is None:
+            _chroma_worker = threading.Thread(
+                target=_chroma_worker_loop, name="chroma-writer", daemon=True
+            )
+            _chroma_worker.start()
+    _chroma_queue.put((str(tweet_id), text, metadata))
+
+
+@atexit.register
+def flush_chroma_queue():
+    """Block until every queued tweet has been handed to ChromaDB."""
+    if _chroma_worker is not None and _chroma_worker.is_alive():
+        _chroma_queue.join()
+
+
 def save_tweet_to_db(tweet_data):
     """Save tweet data to SQLite database, using database-level duplicate prevention."""
+    return save_tweets_to_db([tweet_data])
+
+
+def _payload_str(tweet_data, key):
+    """Return tweet_data[key] as a string; missing or null values become ''."""
+    value = tweet_data.get(key)
+    if value is None:
+        return ""
+    return value if isinstance(value, str) else str(value)
+
+
+def save_tweets_to_db(tweets_data):
+    """Save several tweets to SQLite database in a single transaction.
+
+    Duplicates are skipped by the UNIQUE constraint. If any insert fails the
+    whole batch is rolled back and False is returned.
+    """
+    conn = None
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = get_db()
         c = conn.cursor()
 
-        # Extract data from tweet_data
-        user_name = tweet_data.get("UserName", "")
-        link_to_tweet = tweet_data.get("LinkToTweet", "")
-        text = tweet_data.get("Text", "")
+        saved = []
+        for tweet_data in tweets_data:
+            # Extract data from tweet_data; non-string JSON values are
+            # stored as their string form
+            user_name = _payload_str(tweet_data, "UserName")
+            link_to_tweet = _payload_str(tweet_data, "LinkToTweet")
+            text = _payload_str(tweet_data, "Text")
 
-        # Parse the CreatedAt field
-        created_at_str = tweet_data.get("CreatedAt", "")
-        created_at_parsed = parse_created_at(created_at_str)
+            # Parse the CreatedAt field
+            created_at_str = _payload_str(tweet_data, "CreatedAt")
+            created_at_parsed = parse_created_at(created_at_str)
 
-        # Try to insert the tweet - database will enforce uniqueness
-        try:
+            # Insert the tweet; ON CONFLICT DO NOTHING lets the UNIQUE constraint
+            # drop duplicates (e.g. IFTTT retries) without raising
             c.execute(
-                """INSERT INTO tweets
-                         (user_name, link_to_tweet, created_at, created_at_parsed, text)
-                         VALUES (?, ?, ?, ?, ?)""",
+                INSERT_TWEET_SQL,
                 (
                     user_name,
                     link_to_tweet,
@@ -310,44 +563,101 @@ def save_tweet_to_db(tweet_data):
                     text,
                 ),
             )
-            tweet_id = c.lastrowid
-            conn.commit()
+            if c.rowcount != 1:
+                logger.info("Duplicate tweet prevented by database constraint for user %s", user_name)
+                continue
 
-            # Add to ChromaDB
-            try:
-                CHROMA_COLLECTION.add(
-                    documents=[text],
-                    metadatas=[
-                        {
-                            "tweet_id": tweet_id,
-                            "user_name": user_name,
-                            "link_to_tweet": link_to_tweet,
-                            "created_at": created_at_str,
-                            "created_at_parsed": created_at_parsed,
-                        }
-                    ],
-                    ids=[str(tweet_id)],
-                )
-                logger.debug(f"Tweet added to ChromaDB collection: {tweet_id}")
-            except Exception as e:
-                logger.error(
-                    f"Failed to add tweet to ChromaDB collection {tweet_id}: {e}"
+            saved.append(
+                (
+                    text,
+                    {
+                        "tweet_id": c.lastrowid,
+                        "user_name": user_name,
+                        "link_to_tweet": link_to_tweet,
+                        "created_at": created_at_str,
+                        "created_at_parsed": created_at_parsed,
+                    },
                 )
-
-            conn.close()
-            logger.info("Tweet saved to database successfully")
-            return True
-        except sqlite3.IntegrityError as e:
-            # Duplicate detected by database constraint
-            conn.close()
-            logger.info(
-                f"Duplicate tweet prevented by database constraint for user {user_name}"
             )
-            return True  # Return True to indicate successful processing (even though we didn't save)
+
+        # Commit once for the batch, even if every tweet was a duplicate,
+        # so the shared connection does not hold a lock
+        conn.commit()
     except Exception as e:
+        if conn is not None and conn.in_transaction:
+            conn.rollback()
         logger.error(f"Failed to save tweet to database: {e}")
         return False
 
+    if not saved:
+        return True  # Return True to indicate successful processing (even though we didn't save)
+
+    # The tweets are committed, so report success even if the follow-up work
+    # fails; the ChromaDB worker never moves the high-water mark, so
+    # populate_chromadb backfills anything missing from ChromaDB
+    try:
+        clear_query_cache()
+
+        for text, metadata in saved:
+            # Queue for ChromaDB; the background worker adds it in a batch.
+            # Empty tweets are skipped, as in populate_chromadb.
+            if text.strip():
+                enqueue_chroma_add(metadata["tweet_id"], text, metadata)
+
+            logger.info(
+                "Saved tweet %d from %s (%d chars)",
+                metadata["tweet_id"],
+                metadata["user_name"],
+                len(text),
+            )
+    except Exception as e:
+        logger.error("Failed to queue saved tweets for ChromaDB: %s", e)
+    return True
+
+
+def _query_cache_get(key):
+    """Return the cached result for key, or None if missing or expired."""
+    with _query_cache_lock:
+        entry = _query_cache.get(key)
+        if entry is not None and time.monotonic() - entry[0] < QUERY_CACHE_TTL:
+            _query_cache.move_to_end(key)
+            return entry[1]
+    return None
+
+
+def _query_cache_put(key, tweets):
+    """Cache a result list under key, evicting the least recently used entry."""
+    with _query_cache_lock:
+        _query_cache[key] = (time.monotonic(), tweets)
+        _query_cache.move_to_end(key)
+        if len(_query_cache) > QUERY_CACHE_SIZE:
+            _query_cache.popitem(last=False)
+
+
+def _cached_query(query, params):
+    """Run a read query and return its rows as dicts, reusing recent results.
+
+    The returned list is shared with the cache and must not be modified.
+    """
+    key = (query, tuple(sorted(params.items())))
+    tweets = _query_cache_get(key)
+    if tweets is not None:
+        return tweets
+
+    c = get_db().cursor()
+    c.execute(query, params)
+    # Convert rows to list of dictionaries keyed by column name
+    tweets = [dict(row) for row in c.fetchall()]
+
+    _query_cache_put(key, tweets)
+    return tweets
+
+
+def clear_query_cache():
+    """Drop cached query results after the tweets table changes."""
+    with _query_cache_lock:
+        _query_cache.clear()
+
 
 def search_tweets(search_text=None, limit=10):
     """Search for tweets by search_text with special 'from:' handling.
@@ -361,49 +671,29 @@ def search_tweets(search_text=None, limit=10):
         list: List of tweet dictionaries
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-
-        # Build query based on provided parameters
-        query = """SELECT id, user_name, link_to_tweet, created_at, created_at_parsed, text, received_at
-                   FROM tweets WHERE 1=1"""
-        params = []
-
-        if search_text:
+        # Pick the prebuilt query for the provided parameters
+        if not search_text:
+            query, term = LATEST_TWEETS_SQL, None
+        else:
             # Check if search_text starts with 'from:'
-            if search_text.startswith("from:"):
+            if search_text.startswith(FROM_PREFIX):
                 # Extract the username part and use it for fuzzy matching
-                username_filter = search_text[5:]  # Remove 'from:' prefix
-                query += " AND user_name LIKE ?"
-                params.append(f"%{username_filter}%")
+                column, term = "user_name", search_text[FROM_PREFIX_LEN:]
             else:
                 # Regular search in text fields
-                query += " AND text LIKE ?"
-                params.append(f"%{search_text}%")
-
-        query += " ORDER BY created_at_parsed DESC, created_at DESC LIMIT ?"
-        params.append(limit)
-
-        c.execute(query, params)
-        rows = c.fetchall()
-        conn.close()
+                column, term = "text", search_text
 
-        # Convert rows to list of dictionaries
-        tweets = []
-        for row in rows:
-            tweets.append(
-                {
-                    "id": row[0],
-                    "user_name": row[1],
-                    "link_to_tweet": row[2],
-                    "created_at": row[3],
-                    "created_at_parsed": row[4],
-                    "text": row[5],
-                    "received_at": row[6],
-                }
-            )
+            if len(term) >= FTS_MIN_QUERY_LENGTH:
+                # Match through the trigram FTS index, restricted to the
+                # column and quoted as a phrase so the term is matched literally
+                query = SEARCH_FTS_SQL
+                term = f'{column} : "' + term.replace('"', '""') + '"'
+            else:
+                # Too short for trigrams; fall back to a substring scan
+                query = SEARCH_LIKE_SQL[column]
+                term = f"%{term}%"
 
-        return tweets
+        return _cached_query(query, {"q": term, "limit": limit})
     except Exception as e:
         logger.error(f"Failed to search tweets: {e}")
         return []
@@ -412,134 +702,115 @@ def search_tweets(search_text=None, limit=10):
 def get_latest_tweets(limit=10):
     """Get the latest n tweets from the database, sorted by createdAt."""
     try:
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
         # Order by created_at_parsed descending to get latest tweets first
         # Use created_at as fallback if created_at_parsed is NULL
-        c.execute(
-            """SELECT id, user_name, link_to_tweet, created_at, created_at_parsed, text, received_at
-                     FROM tweets
-                     ORDER BY created_at_parsed DESC, created_at DESC
-                     LIMIT ?""",
-            (limit,),
-        )
-        rows = c.fetchall()
-        conn.close()
-
-        # Convert rows to list of dictionaries
-        tweets = []
-        for row in rows:
-            tweets.append(
-                {
-                    "id": row[0],
-                    "user_name": row[1],
-                    "link_to_tweet": row[2],
-                    "created_at": row[3],
-                    "created_at_parsed": row[4],
-                    "text": row[5],
-                    "received_at": row[6],
-                }
-            )
-
-        return tweets
+        return _cached_query(LATEST_TWEETS_SQL, {"limit": limit})
     except Exception as e:
         logger.error(f"Failed to fetch tweets from database: {e}")
         return []
 
 
+def get_chroma_high_water_mark(conn):
+    """Return the highest tweet id known to be in ChromaDB, or None if unknown."""
+    row = conn.execute("SELECT max_tweet_id FROM chroma_state WHERE id = 1").fetchone()
+    return row[0] if row else None
+
+
+def set_chroma_high_water_mark(conn, tweet_id):
+    """Record that ChromaDB holds tweets up to tweet_id."""
+    conn.execute(
+        "UPDATE chroma_state SET max_tweet_id = MAX(COALESCE(max_tweet_id, 0), ?) WHERE id = 1",
+        (tweet_id,),
+    )
+    conn.commit()
+
+
+def reset_chroma_high_water_mark(conn):
+    """Forget the high-water mark so the next population starts from the beginning."""
+    conn.execute("UPDATE chroma_state SET max_tweet_id = NULL WHERE id = 1")
+    conn.commit()
+
+
 def populate_chromadb():
     """Populate ChromaDB with existing tweets from SQLite database, resuming from last added tweet."""
     try:
         logger.info("Checking ChromaDB status for incremental population...")
-        conn = sqlite3.connect(DB_PATH)
+        conn = get_db()
         c = conn.cursor()
 
-        # Check if ChromaDB already has tweets and get the last tweet_id
-        max_chroma_id = None
-        try:
-            results = CHROMA_COLLECTION.get(include=["metadatas"])
-            if results["metadatas"]:
-                tweet_ids = [
-                    int(metadata["tweet_id"])
-                    for metadata in results["metadatas"]
-                    if metadata.get("tweet_id") is not None
-                ]
-                if tweet_ids:
-                    max_chroma_id = max(tweet_ids)
-                    logger.info(
-                        f"ChromaDB already contains tweets up to tweet_id {max_chroma_id}, resuming from there"
-                    )
-                else:
-                    logger.info("ChromaDB is empty, starting population from beginning")
-            else:
-                logger.info("ChromaDB is empty, starting population from beginning")
-        except Exception as e:
-            logger.warning(
-                f"Failed to check ChromaDB status: {e}, starting population from beginning"
-            )
-            max_chroma_id = None
+        # Open the collection first; creating it resets the high-water mark
+        get_chroma_collection()
 
-        # Get tweets from database that haven't been added to ChromaDB yet
-        if max_chroma_id is not None:
-            c.execute(
-                """SELECT id, user_name, link_to_tweet, created_at, created_at_parsed, text
-                         FROM tweets
-                         WHERE id > ?
-                         ORDER BY id ASC""",
-                (max_chroma_id,),
+        # Get the last tweet_id added to ChromaDB from the high-water mark.
+        # An unknown mark starts from the beginning; tweets ChromaDB already
+        # holds are skipped without being embedded again.
+        max_chroma_id = get_chroma_high_water_mark(conn)
+        if max_chroma_id:
+            logger.info(
+                f"ChromaDB already contains tweets up to tweet_id {max_chroma_id}, resuming from there"
             )
         else:
-            c.execute(
-                """SELECT id, user_name, link_to_tweet, created_at, created_at_parsed, text
-                         FROM tweets
-                         ORDER BY id ASC"""
-            )
-
-        rows = c.fetchall()
-        conn.close()
-
-        if not rows:
-            logger.info("No new tweets found to add to ChromaDB")
-            return
+            logger.info("ChromaDB high-water mark unknown, starting population from beginning")
 
-        # Prepare data for ChromaDB
-        documents = []
-        metadatas = []
-        ids = []
-
-        for row in rows:
-            tweet_id, user_name, link_to_tweet, created_at, created_at_parsed, text = (
-                row
-            )
-
-            # Skip if text is empty
-            if not text:
-                continue
-
-            documents.append(text)
-            metadatas.append(
-                {
+        # Get tweets from database that haven't been added to ChromaDB yet
+        c.arraysize = 1024
+        c.execute(CHROMA_BACKFILL_SQL, (max_chroma_id or 0,))
+
+        last_id = None
+
+        def chroma_entries():
+            """Yield (document, metadata, id) for each row, skipping empty text."""
+            nonlocal last_id
+            for tweet_id, user_name, link_to_tweet, created_at, created_at_parsed, text in c:
+                last_id = tweet_id
+                # Skip if text is empty
+                if not text:
+                    continue
+                yield text, {
                     "tweet_id": tweet_id,
                     "user_name": user_name,
                     "link_to_tweet": link_to_tweet,
                     "created_at": created_at,
                     "created_at_parsed": created_at_parsed,
-                }
-            )
-            ids.append(str(tweet_id))
-
-        # Add to ChromaDB in batches to avoid memory issues
-        batch_size = 32  # Match Hugging Face server batch size limit
-        for i in range(0, len(documents), batch_size):
-            batch_documents = documents[i : i + batch_size]
-            batch_metadatas = metadatas[i : i + batch_size]
-            batch_ids = ids[i : i + batch_size]
+                }, str(tweet_id)
+
+        # Add to ChromaDB in batches, streaming rows from the cursor. Each
+        # window of rows is sorted by text length so a batch holds similarly
+        # sized documents and the embedding server pads less. The high-water
+        # mark advances after every window, so an interrupted run resumes
+        # without re-embedding the windows it already added.
+        count = 0
+        entries = chroma_entries()
+        while True:
+            window = list(itertools.islice(entries, CHROMA_SORT_WINDOW))
+            if not window:
+                break
+            window.sort(key=lambda entry: len(entry[0]))
+            for i in range(0, len(window), CHROMA_BATCH_SIZE):
+                batch = window[i : i + CHROMA_BATCH_SIZE]
+                # Tweets the webhook already added are skipped rather than
+                # embedded again
+                existing = set(
+                    get_chroma_collection().get(ids=[entry[2] for entry in batch], include=[])["ids"]
+                )
+                batch = [entry for entry in batch if entry[2] not in existing]
+                if not batch:
+                    continue
+                batch_documents, batch_metadatas, batch_ids = map(list, zip(*batch))
+                get_chroma_collection().add(
+                    documents=batch_documents, metadatas=batch_metadatas, ids=batch_ids
+                )
+                count += len(batch)
+            set_chroma_high_water_mark(conn, last_id)
 
-            CHROMA_COLLECTION.add(
-                documents=batch_documents, metadatas=batch_metadatas, ids=batch_ids
-            )
+        if last_id is None:
+            logger.info("No new tweets found to add to ChromaDB")
+            if max_chroma_id is not None:
+                set_chroma_high_water_mark(conn, max_chroma_id)
+            return
 
-        logger.info(f"Successfully added {len(documents)} new tweets to ChromaDB")
+        set_chroma_high_water_mark(conn, last_id)
+        logger.info(f"Successfully added {count} new tweets to ChromaDB")
     except Exception as e:
         logger.error(f"Failed to populate ChromaDB: {e}")
 
@@ -554,9 +825,15 @@ def semantic_search_tweets(query_text, limit=10):
     Returns:
         list: List of tweet dictionaries with similarity scores
     """
+    # Repeated queries within the TTL skip the embedding request and HNSW lookup
+    key = ("semantic", query_text, limit)
+    tweets = _query_cache_get(key)
+    if tweets is not None:
+        return tweets
+
     try:
-        logger.debug(f"Performing semantic search with ChromaDB: {query_text}")
-        results = CHROMA_COLLECTION.query(query_texts=[query_text], n_results=limit)
+        logger.debug("Performing semantic search with ChromaDB: %s", query_text)
+        results = get_chroma_collection().query(query_texts=[query_text], n_results=limit)
 
         # Convert results to the expected format
         tweets = []
@@ -576,29 +853,56 @@ def semantic_search_tweets(query_text, limit=10):
                 }
             )
 
+        _query_cache_put(key, tweets)
         return tweets
     except Exception as e:
         logger.error(f"Failed to perform semantic search with ChromaDB: {e}")
         return []
 
 
+@functools.lru_cache(maxsize=8)
+def _hmac_template(secret_token):
+    """Return an HMAC-SHA256 object keyed with secret_token and fed no data.
+
+    Copying it per request reuses the keyed inner and outer hash states
+    instead of deriving them from the key every time. The template itself
+    is never updated.
+    """
+    return hmac.new(secret_token, digestmod="sha256")
+
+
 def verify_signature(payload_body, secret_token, signature_header):
     """Verify that the payload was sent from IFTTT by validating SHA256.
 
     Args:
         payload_body: original request body to verify (bytes)
-        secret_token: webhook secret token (str)
+        secret_token: webhook secret token (bytes, e.g. SECRET_KEY_BYTES, or str)
         signature_header: value of X-Signature header (str)
     Returns:
         bool: True if the signature is valid, False otherwise
     """
-    if not signature_header:
+    if not signature_header or not signature_header.startswith(SIGNATURE_PREFIX):
+        return False
+    # Compare raw digests rather than their hex forms
+    try:
+        provided = binascii.unhexlify(signature_header[SIGNATURE_PREFIX_LEN:])
+    except (binascii.Error, ValueError):
         return False
-    expected_signature = hmac.new(
-        secret_token.encode("utf-8"), payload_body, hashlib.sha256
-    ).hexdigest()
-    expected_signature = "sha256=" + expected_signature
-    return hmac.compare_digest(expected_signature, signature_header)
+    # Reject wrong-length digests before hashing the payload
+    if len(provided) != SIGNATURE_DIGEST_SIZE:
+        return False
+    if isinstance(secret_token, str):
+        secret_token = secret_token.encode("utf-8")
+    mac = _hmac_template(secret_token).copy()
+    mac.update(payload_body)
+    return hmac.compare_digest(mac.digest(), provided)
+
+
+def _clamp_limit(req):
+    """Return the request's limit query parameter, defaulting to 10, clamped to 1..100."""
+    # Werkzeug returns the default when the value is not an integer
+    limit = req.args.get("limit", default=10, type=int)
+    return 1 if limit < 1 else 100 if limit > 100 else limit
 
 
 @app.route("/ifttt/twitter", methods=["POST"])
@@ -608,17 +912,36 @@ def handle_ifttt_twitter_webhook():
     signature_header = request.headers.get("X-Signature")
     payload = request.get_data()
 
+    # Verify the signature over the raw body when required
+    if REQUIRE_SIGNATURE and SECRET_KEY:
+        if not verify_signature(payload, SECRET_KEY_BYTES, signature_header):
+            logger.warning("Rejected webhook request with invalid signature")
+            return jsonify({"error": "Invalid signature"}), 401
+
+    # Log the raw body for debugging once it is authenticated, so anonymous
+    # clients cannot fill the log, but before parsing so malformed payloads
+    # are captured too; the bytes are decoded only if the logger is enabled
+    if payload_logger.isEnabledFor(logging.DEBUG):
+        payload_logger.debug("%s", payload.decode("utf-8", "replace"))
+
+    try:
+        tweet_data = orjson.loads(payload)
+    except orjson.JSONDecodeError:
+        return jsonify({"error": "Invalid JSON payload"}), 400
+    if not isinstance(tweet_data, dict):
+        return jsonify({"error": "Invalid JSON payload"}), 400
+
+    if not save_tweet_to_db(tweet_data):
+        return jsonify({"error": "Failed to save tweet"}), 500
+
+    return jsonify({"status": "success", "message": "Tweet received"})
+
 
 @app.route("/tweets/latest", methods=["GET"])
 def get_latest_tweets_route():
     # Get the latest n tweets from the database, sorted by createdAt
     # Get limit parameter from query string, default to 10
-    try:
-        limit = int(request.args.get("limit", 10))
-        # Ensure limit is between 1 and 100
-        limit = max(1, min(limit, 100))
-    except (TypeError, ValueError):
-        limit = 10
+    limit = _clamp_limit(request)
 
     # Fetch tweets from database
     tweets = get_latest_tweets(limit)
@@ -636,12 +959,7 @@ def search_tweets_route():
     search_text = request.args.get("query")
 
     # Get limit parameter from query string, default to 10
-    try:
-        limit = int(request.args.get("limit", 10))
-        # Ensure limit is between 1 and 100
-        limit = max(1, min(limit, 100))
-    except (TypeError, ValueError):
-        limit = 10
+    limit = _clamp_limit(request)
 
     # Validate that search text parameter is provided
     if not search_text:
@@ -670,12 +988,7 @@ def semantic_search_tweets_route():
     query_text = request.args.get("query")
 
     # Get limit parameter from query string, default to 10
-    try:
-        limit = int(request.args.get("limit", 10))
-        # Ensure limit is between 1 and 100
-        limit = max(1, min(limit, 100))
-    except (TypeError, ValueError):
-        limit = 10
+    limit = _clamp_limit(request)
 
     # Validate that query text parameter is provided
     if not query_text:
@@ -694,16 +1007,32 @@ def semantic_search_tweets_route():
     )
 
 
-@app.route("/health", methods=["GET"])
-def health_check():
-    # Health check endpoint
-    return jsonify({"status": "healthy", "timestamp": datetime.now().isoformat()})
+# Timestamp string shared by /health and / for up to a second
+_now_iso_cache = (0.0, "")
 
 
-@app.route("/", methods=["GET"])
-def home():
-    # Home endpoint with server information
-    return jsonify(
+def _now_iso():
+    """Return the current local time in ISO format, refreshed at most once a second."""
+    global _now_iso_cache
+    now = time.time()
+    cached_at, cached = _now_iso_cache
+    if now - cached_at >= 1.0:
+        cached = datetime.fromtimestamp(now).isoformat()
+        # Replaced as one tuple so concurrent readers never see a mix
+        _now_iso_cache = (now, cached)
+    return cached
+
+
+@functools.lru_cache(maxsize=1)
+def _health_body(timestamp):
+    """Return the encoded /health body for timestamp."""
+    return orjson.dumps({"status": "healthy", "timestamp": timestamp})
+
+
+@functools.lru_cache(maxsize=1)
+def _home_body(timestamp):
+    """Return the encoded / body for timestamp."""
+    return orjson.dumps(
         {
             "message": "IFTTT Twitter Webhook Server is running",
             "endpoints": {
@@ -714,11 +1043,23 @@ def home():
                 "health": "/health (GET)",
                 "home": "/ (GET)",
             },
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": timestamp,
         }
     )
 
 
+@app.route("/health", methods=["GET"])
+def health_check():
+    # Health check endpoint; the body only changes when the timestamp does
+    return app.response_class(_health_body(_now_iso()), mimetype="application/json")
+
+
+@app.route("/", methods=["GET"])
+def home():
+    # Home endpoint with server information
+    return app.response_class(_home_body(_now_iso()), mimetype="application/json")
+
+
 def main():
     # Main function to run the application
     # Initialize database
@@ -0,0 +1,36 @@
+"""
+Configuration loading shared by the application, migrations and scripts.
+"""
+
+import functools
+import json
+import os
+from pathlib import Path
+
+CONFIG_PATH = "config/config.json"
+
+
+@functools.lru_cache(maxsize=1)
+def load_config():
+    """Load configuration from config.json file.
+
+    The file is read once per process; later calls return the same dict.
+    """
+    try:
+        return json.loads(Path(CONFIG_PATH).read_bytes())
+    except FileNotFoundError:
+        # Default configuration for Twitter webhook
+        return {
+            "server": {"host": "0.0.0.0", "port": 5000, "debug": False},
+            "security": {
+                "secret_key": os.environ.get("WEBHOOK_SECRET", "default_secret_key"),
+                "require_signature": False,
+            },
+            "logging": {"level": "INFO", "file": "logs/app.log"},
+            "database": {
+                "path": "data/tweets.db",
+                "csv_path": "data/Tweets - Sheet1.csv",
+            },
+            "debug_logging": {"payload_log_file": "logs/payload.log"},
+            "chromadb": {"async_add": True},
+        }
@@ -0,0 +1,59 @@
+"""
+SQLite connection helpers shared by the application, migrations and scripts.
+"""
+
+import sqlite3
+
+# Per-connection tuning applied right after connect.
+# journal_mode=WAL is persistent in the database file, the others are not.
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-16000",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA busy_timeout=5000",
+)
+
+
+def tune_connection(conn):
+    """Apply the standard PRAGMAs to an open SQLite connection."""
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+def connect(db_path, **kwargs):
+    """Open a SQLite connection to db_path with the standard PRAGMAs applied.
+
+    Extra keyword arguments are passed through to sqlite3.connect.
+    """
+    conn = sqlite3.connect(db_path, **kwargs)
+    return tune_connection(conn)
+
+
+def drop_secondary_indexes(cursor, table):
+    """Drop the non-unique indexes created on table with CREATE INDEX.
+
+    Unique indexes are kept so INSERT OR IGNORE still skips duplicates.
+    Returns the CREATE INDEX statements needed to rebuild them.
+    """
+    cursor.execute(f'PRAGMA index_list("{table}")')
+    names = [row[1] for row in cursor.fetchall() if not row[2] and row[3] == "c"]
+
+    index_sql = []
+    for name in names:
+        cursor.execute("SELECT sql FROM sqlite_master WHERE type='index' AND name=?", (name,))
+        index_sql.append(cursor.fetchone()[0])
+        cursor.execute(f'DROP INDEX "{name}"')
+    return index_sql
+
+
+def optimize_and_close(conn):
+    """Refresh planner statistics where needed, then close the connection.
+
+    analysis_limit bounds the ANALYZE work PRAGMA optimize may trigger.
+    """
+    conn.execute("PRAGMA analysis_limit=1000")
+    conn.execute("PRAGMA optimize")
+    conn.close()
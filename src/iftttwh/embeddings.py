@@ -0,0 +1,103 @@
+"""
+Embedding function backed by a local Hugging Face text-embeddings server.
+"""
+
+import collections
+import hashlib
+import threading
+
+from chromadb import Documents, EmbeddingFunction, Embeddings
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+# Custom embedding function for local Hugging Face server
+class LocalHuggingFaceEmbeddingFunction(EmbeddingFunction):
+    def __init__(self, server_url="http://huggingface-embeddings:80", cache_size=2048):
+        self.server_url = server_url.rstrip("/")
+        # Recently computed embeddings keyed by a BLAKE2 digest of the text
+        self.cache_size = cache_size
+        self._cache = collections.OrderedDict()
+        self._cache_lock = threading.Lock()
+        # Keep-alive session so embedding batches reuse pooled connections;
+        # embedding is idempotent, so POSTs are safe to retry
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=2, backoff_factor=0.1, allowed_methods=frozenset(["POST"])
+            ),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def __call__(self, input: Documents) -> Embeddings:
+        """Generate embeddings for the given documents, reusing cached ones.
+
+        Only documents missing from the cache are sent to the server.
+        """
+        keys = [
+            hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+            for text in input
+        ]
+        with self._cache_lock:
+            embeddings = [self._cache.get(key) for key in keys]
+            for key, embedding in zip(keys, embeddings):
+                if embedding is not None:
+                    self._cache.move_to_end(key)
+
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            fetched = self._embed([input[i] for i in missing])
+            if len(fetched) != len(missing):
+                raise ValueError(
+                    f"Server returned {len(fetched)} embeddings for {len(missing)} documents"
+                )
+            with self._cache_lock:
+                for i, embedding in zip(missing, fetched):
+                    embeddings[i] = embedding
+                    self._cache[keys[i]] = embedding
+                    self._cache.move_to_end(keys[i])
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        return embeddings
+
+    def _embed(self, input):
+        """Generate embeddings for the given documents using local Hugging Face server."""
+        try:
+            # Prepare the request payload
+            payload = {"inputs": input}
+
+            # Make request to the local server
+            response = self.session.post(
+                f"{self.server_url}/embed",
+                data=orjson.dumps(payload),
+                headers={"Content-Type": "application/json"},
+            )
+
+            if response.status_code == 200:
+                embeddings = orjson.loads(response.content)
+                # Ensure we return a list of lists (embeddings for each document)
+                if isinstance(embeddings, list) and len(embeddings) > 0:
+                    # If it's a list of embeddings, return as is
+                    if isinstance(embeddings[0], list):
+                        return embeddings
+                    # If it's a single embedding, wrap it in a list
+                    else:
+                        return [embeddings]
+                else:
+                    raise ValueError(
+                        f"Unexpected response format from server: {embeddings}"
+                    )
+            else:
+                raise Exception(
+                    f"Server returned status code {response.status_code}: {response.text}"
+                )
+
+        except Exception as e:
+            print(f"Failed to get embeddings from local Hugging Face server: {e}")
+            raise
@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+"""
+WSGI entry point for running the application under a production server:
+
+    gunicorn --pythonpath src -w 1 -k gthread --threads 8 -b 0.0.0.0:5000 wsgi:app
+
+Run a single worker process with several threads. ChromaDB's persistent
+client and the background ChromaDB writer are per-process and must not
+be shared by several workers.
+"""
+
+import sys
+import os
+
+# Add the src directory to the path so we can import the package
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "."))
+
+from iftttwh.app import app, init_db  # noqa: F401 - app is looked up by gunicorn
+
+# Apply migrations and sync ChromaDB once when the worker starts
+init_db()
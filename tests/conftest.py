@@ -0,0 +1,35 @@
+import os
+import sys
+
+import pytest
+
+# Add the src and migrations directories to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'migrations'))
+
+from iftttwh import app
+from apply_migration import MigrationManager
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), '..', 'migrations')
+
+
+@pytest.fixture
+def tmp_db(tmp_path, monkeypatch):
+    """Point the app at a freshly migrated database under tmp_path.
+
+    Saved tweets are not queued for ChromaDB, so no embeddings service is
+    needed. Yields the app's connection to the database.
+    """
+    db_path = str(tmp_path / "tweets.db")
+    manager = MigrationManager(db_path, MIGRATIONS_DIR)
+    assert manager.apply_all_pending()
+    manager.close()
+
+    monkeypatch.setattr(app, "DB_PATH", db_path)
+    monkeypatch.setattr(app, "_db_local", app.threading.local())
+    monkeypatch.setattr(app, "enqueue_chroma_add", lambda tweet_id, text, metadata: None)
+    app.clear_query_cache()
+
+    conn = app.get_db()
+    yield conn
+    conn.close()
@@ -10,6 +10,7 @@ import sqlite3
 # Add the src directory to the path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
+from iftttwh import app
 from iftttwh.app import init_db, semantic_search_tweets, DB_PATH
 
 def test_chromadb_implementation():
@@ -39,6 +40,75 @@ def test_chromadb_implementation():
         print(f"ERROR: Semantic search failed with error: {e}")
         return False
 
+def test_new_collection_resets_high_water_mark(tmp_path, monkeypatch):
+    """Test that creating an empty collection forgets a stale high-water mark."""
+    # Point the app at a fresh database and ChromaDB directory
+    monkeypatch.setattr(app, "DB_PATH", str(tmp_path / "tweets.db"))
+    monkeypatch.setattr(app, "CHROMA_PATH", str(tmp_path / "chroma_db"))
+    monkeypatch.setattr(app, "_chroma_collection", None)
+    monkeypatch.setattr(app, "_db_local", app.threading.local())
+    
+    conn = app.get_db()
+    migration = os.path.join(os.path.dirname(__file__), '..', 'migrations', '004_add_chroma_state.sql')
+    with open(migration) as f:
+        conn.executescript(f.read())
+    
+    # A mark left over from a collection that has since been deleted
+    app.set_chroma_high_water_mark(conn, 42)
+    assert app.get_chroma_high_water_mark(conn) == 42
+    
+    app.get_chroma_collection()
+    assert app.get_chroma_high_water_mark(conn) is None
+    
+    # Opening the now existing collection again keeps the mark
+    app.set_chroma_high_water_mark(conn, 7)
+    monkeypatch.setattr(app, "_chroma_collection", None)
+    app.get_chroma_collection()
+    assert app.get_chroma_high_water_mark(conn) == 7
+    conn.close()
+
+
+class FakeCollection:
+    """In-memory stand-in for the ChromaDB tweets collection."""
+    
+    def __init__(self):
+        self.documents = {}
+        self.fail = False
+    
+    def add(self, documents, metadatas, ids):
+        if self.fail:
+            raise RuntimeError("embeddings service unavailable")
+        self.documents.update(zip(ids, documents))
+    
+    def get(self, ids, include):
+        return {"ids": [i for i in ids if i in self.documents]}
+
+def test_failed_batch_is_backfilled(tmp_db, monkeypatch):
+    """Test that a batch which fails to reach ChromaDB is added by populate_chromadb."""
+    collection = FakeCollection()
+    monkeypatch.setattr(app, "get_chroma_collection", lambda: collection)
+    
+    for n in range(3):
+        assert app.save_tweet_to_db({
+            "UserName": "testuser",
+            "LinkToTweet": f"https://twitter.com/testuser/status/{n}",
+            "CreatedAt": "September 08, 2025 at 02:39PM",
+            "Text": f"tweet {n}",
+        })
+    ids = [str(row[0]) for row in tmp_db.execute("SELECT id FROM tweets ORDER BY id")]
+    
+    # The first batch fails and a later one succeeds; the mark must not
+    # move past the tweet that is missing
+    collection.fail = True
+    app._add_chroma_batch([(ids[0], "tweet 0", {})])
+    collection.fail = False
+    app._add_chroma_batch([(ids[2], "tweet 2", {})])
+    assert app.get_chroma_high_water_mark(tmp_db) is None
+    
+    app.populate_chromadb()
+    assert set(collection.documents) == set(ids)
+    assert app.get_chroma_high_water_mark(tmp_db) == int(ids[-1])
+
 if __name__ == "__main__":
     success = test_chromadb_implementation()
     sys.exit(0 if success else 1)
\ No newline at end of file
@@ -9,9 +9,9 @@ import os
 # Add the src directory to the path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from iftttwh.app import save_tweet_to_db
+from iftttwh.app import save_tweet_to_db, save_tweets_to_db
 
-def test_current_implementation():
+def test_current_implementation(tmp_db):
     """Test that the current implementation works correctly."""
     # Test tweet data
     tweet1 = {
@@ -39,26 +39,37 @@ def test_current_implementation():
     
     # Save first tweet
     print("Saving first tweet...")
-    result1 = save_tweet_to_db(tweet1)
-    print(f"Result: {result1}")
+    assert save_tweet_to_db(tweet1)
     
-    # Save second tweet (identical to first) - should be prevented
-    print("\nSaving second tweet (identical to first)...")
-    result2 = save_tweet_to_db(tweet2)
-    print(f"Result: {result2}")
+    # Save second tweet (identical to first) - should be prevented - and
+    # third tweet (different) - should be saved - in one transaction
+    print("Saving second (identical to first) and third (different) tweets as a batch...")
+    assert save_tweets_to_db([tweet2, tweet3])
     
-    # Save third tweet (different) - should be saved
-    print("\nSaving third tweet (different)...")
-    result3 = save_tweet_to_db(tweet3)
-    print(f"Result: {result3}")
+    rows = tmp_db.execute('SELECT link_to_tweet FROM tweets ORDER BY id').fetchall()
+    assert [row[0] for row in rows] == [tweet1['LinkToTweet'], tweet3['LinkToTweet']]
     
-    if result1 and result2 and result3:
-        print("\n✓ All tests passed!")
-        return True
-    else:
-        print("\n✗ Some tests failed!")
-        return False
+    # A failing insert rolls back the whole batch, including the valid tweet
+    tweet4 = dict(tweet3, LinkToTweet='https://twitter.com/testuser/status/111222333')
+    print("Saving a batch with a malformed entry...")
+    assert not save_tweets_to_db([tweet4, None])
+    assert tmp_db.execute('SELECT COUNT(*) FROM tweets').fetchone()[0] == 2
+    assert not tmp_db.in_transaction
 
-if __name__ == "__main__":
-    success = test_current_implementation()
-    sys.exit(0 if success else 1)
\ No newline at end of file
+def test_non_string_fields(tmp_db):
+    """Test that null or non-string payload fields are saved as strings."""
+    tweet = {
+        'UserName': 12345,
+        'LinkToTweet': 'https://twitter.com/testuser/status/555555555',
+        'CreatedAt': None,
+        'Text': None,
+    }
+    
+    print("Saving tweet with non-string fields...")
+    assert save_tweet_to_db(tweet)
+    
+    row = tmp_db.execute(
+        'SELECT user_name, created_at, text FROM tweets WHERE link_to_tweet = ?',
+        (tweet['LinkToTweet'],),
+    ).fetchone()
+    assert tuple(row) == ('12345', '', '')
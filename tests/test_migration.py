@@ -7,100 +7,154 @@ import os
 import sqlite3
 import sys
 import tempfile
-import shutil
+
+# Add the src and migrations directories to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'migrations'))
+
+from iftttwh.db_utils import connect
+from apply_migration import MigrationManager, split_statements
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), '..', 'migrations')
+
+# Finds one pair of rows sharing the dedup key; with the unique index the
+# inner table is probed through the index instead of being grouped
+DUPLICATE_PAIR_SQL = '''SELECT t1.id, t2.id
+                        FROM tweets t1
+                        JOIN tweets t2
+                          ON t2.user_name IS t1.user_name
+                         AND t2.link_to_tweet IS t1.link_to_tweet
+                         AND t2.text IS t1.text
+                         AND t2.id > t1.id
+                        LIMIT 1'''
+
+INSERT_SQL = '''INSERT INTO tweets
+                (user_name, link_to_tweet, created_at, created_at_parsed, text)
+                VALUES (?, ?, ?, ?, ?)'''
 
 def test_migration():
-    """Test the migration functionality."""
-    # Create a temporary directory for testing
-    test_dir = tempfile.mkdtemp()
-    db_path = os.path.join(test_dir, 'test.db')
-    
-    try:
-        # Create a test database with duplicates
-        conn = sqlite3.connect(db_path)
-        c = conn.cursor()
-        
-        # Create table without unique constraint
-        c.execute('''CREATE TABLE tweets
-                     (id INTEGER PRIMARY KEY AUTOINCREMENT,
-                      user_name TEXT,
-                      link_to_tweet TEXT,
-                      created_at TEXT,
-                      created_at_parsed TIMESTAMP,
-                      text TEXT,
-                      received_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)''')
-        
-        # Insert some duplicate tweets
-        tweets_data = [
-            ('user1', 'link1', '2025-01-01', '2025-01-01 10:00:00', 'text1'),
-            ('user1', 'link1', '2025-01-01', '2025-01-01 10:00:00', 'text1'),  # duplicate
-            ('user2', 'link2', '2025-01-02', '2025-01-02 11:00:00', 'text2'),
-            ('user1', 'link1', '2025-01-01', '2025-01-01 10:00:00', 'text1'),  # duplicate
-            ('user3', 'link3', '2025-01-03', '2025-01-03 12:00:00', 'text3'),
-        ]
-        
-        for tweet in tweets_data:
-            c.execute('''INSERT INTO tweets 
-                         (user_name, link_to_tweet, created_at, created_at_parsed, text)
-                         VALUES (?, ?, ?, ?, ?)''', tweet)
-        
-        conn.commit()
-        
-        # Count initial tweets
-        c.execute('SELECT COUNT(*) FROM tweets')
-        initial_count = c.fetchone()[0]
-        print(f"Initial tweet count: {initial_count}")
-        
-        # Close connection
-        conn.close()
-        
-        # Copy migration script to test directory
+    """Test that the migrations build a schema that rejects duplicate tweets."""
+    with tempfile.TemporaryDirectory() as test_dir:
+        db_path = os.path.join(test_dir, 'test.db')
+
+        # Apply every migration to a fresh database
+        manager = MigrationManager(db_path, MIGRATIONS_DIR)
+        assert manager.apply_all_pending()
+        assert manager.get_pending_migrations() == []
+        manager.close()
+
+        # Transactions are opened explicitly so each batch commits exactly once
+        conn = connect(db_path, isolation_level=None)
+        try:
+            c = conn.cursor()
+
+            # Insert some duplicate tweets the way the app does
+            tweets_data = [
+                ('user1', 'link1', '2025-01-01', '2025-01-01 10:00:00', 'text1'),
+                ('user1', 'link1', '2025-01-01', '2025-01-01 10:00:00', 'text1'),  # duplicate
+                ('user2', 'link2', '2025-01-02', '2025-01-02 11:00:00', 'text2'),
+                ('user1', 'link1', '2025-01-01', '2025-01-01 10:00:00', 'text1'),  # duplicate
+                ('user3', 'link3', '2025-01-03', '2025-01-03 12:00:00', 'text3'),
+            ]
+
+            c.execute('BEGIN IMMEDIATE')
+            c.executemany(INSERT_SQL.replace('INSERT', 'INSERT OR IGNORE', 1), tweets_data)
+            c.execute('COMMIT')
+
+            # A plain insert of a duplicate is rejected by the constraint
+            try:
+                c.execute(INSERT_SQL, tweets_data[0])
+            except sqlite3.IntegrityError:
+                pass
+            else:
+                raise AssertionError("Duplicate tweet was inserted")
+
+            # Check the count and for duplicates in one query; the duplicate
+            # check stops at the first pair
+            c.execute(f'SELECT (SELECT COUNT(*) FROM tweets), EXISTS ({DUPLICATE_PAIR_SQL})')
+            final_count, has_duplicates = c.fetchone()
+            print(f"Final tweet count: {final_count}")
+            print(f"Duplicates found: {has_duplicates}")
+            assert final_count == 3
+            assert not has_duplicates
+
+            # The check should probe the unique index, not build a temp
+            # B-tree or an automatic index
+            c.execute('EXPLAIN QUERY PLAN ' + DUPLICATE_PAIR_SQL)
+            plan = [row[3] for row in c.fetchall()]
+            print(f"Duplicate check plan: {'; '.join(plan)}")
+            assert any(step.startswith('SEARCH') and 't2 USING' in step
+                       and 'AUTOMATIC' not in step for step in plan)
+            assert not any('TEMP B-TREE' in step for step in plan)
+
+            # The FTS triggers index inserted tweets by text and user name
+            c.execute("SELECT COUNT(*) FROM tweets_fts WHERE tweets_fts MATCH 'user_name : \"user2\"'")
+            assert c.fetchone()[0] == 1
+        finally:
+            conn.close()
+
+    print("Migration test PASSED")
+
+def test_unrecorded_migration_rolls_back():
+    """Test that a migration whose tracking row cannot be written is not committed."""
+    with tempfile.TemporaryDirectory() as test_dir:
+        db_path = os.path.join(test_dir, 'test.db')
         migrations_dir = os.path.join(test_dir, 'migrations')
         os.makedirs(migrations_dir)
-        migration_script = os.path.join(migrations_dir, '001_add_unique_constraint.sql')
-        shutil.copy('migrations/001_add_unique_constraint.sql', migration_script)
         
-        # Apply migration
-        conn = sqlite3.connect(db_path)
-        with open(migration_script, 'r') as f:
-            migration_sql = f.read()
-            
-        conn.executescript(migration_sql)
-        conn.commit()
-        conn.close()
+        # The migration itself succeeds, but recording it then fails
+        with open(os.path.join(migrations_dir, '000_init.sql'), 'w') as f:
+            f.write('CREATE TABLE users (id INTEGER PRIMARY KEY);\n'
+                    'DROP TABLE applied_migrations;\n')
         
-        # Check final count
-        conn = sqlite3.connect(db_path)
-        c = conn.cursor()
-        c.execute('SELECT COUNT(*) FROM tweets')
-        final_count = c.fetchone()[0]
-        print(f"Final tweet count: {final_count}")
-        
-        # Check for duplicates
-        c.execute('''SELECT user_name, link_to_tweet, text, COUNT(*) 
-                     FROM tweets 
-                     GROUP BY user_name, link_to_tweet, text 
-                     HAVING COUNT(*) > 1''')
-        duplicates = c.fetchall()
-        print(f"Duplicates found: {len(duplicates)}")
+        # Create the database and the tracking table first
+        sqlite3.connect(db_path).close()
+        manager = MigrationManager(db_path, migrations_dir)
+        assert not manager.apply_all_pending()
         
+        conn = sqlite3.connect(db_path)
+        try:
+            tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        finally:
+            conn.close()
+        assert 'users' not in tables
+        assert 'applied_migrations' in tables
+
+def test_split_statements():
+    """Test that migration scripts are split without rewriting their statements."""
+    script = (
+        "-- Leading comment\n"
+        "CREATE TABLE notes (body TEXT);\n"
+        "BEGIN TRANSACTION;\n"
+        "INSERT INTO notes VALUES ('a;b\n-- not a comment');\n"
+        "CREATE TRIGGER notes_ai AFTER INSERT ON notes BEGIN\n"
+        "    SELECT 1;\n"
+        "END;\n"
+        "COMMIT;\n"
+    )
+    statements = split_statements(script)
+    assert len(statements) == 3
+    
+    # The statements run as written, string literals included
+    conn = sqlite3.connect(':memory:')
+    try:
+        for statement in statements:
+            conn.execute(statement)
+        assert conn.execute('SELECT body FROM notes').fetchone()[0] == 'a;b\n-- not a comment'
+    finally:
         conn.close()
-        
-        # Verify results
-        if final_count == 3 and len(duplicates) == 0:
-            print("Migration test PASSED")
-            return True
+    
+    # Transaction control other than one outer BEGIN ... COMMIT is rejected
+    for script in ("CREATE TABLE a (x);\nCOMMIT;\nCREATE TABLE b (x);\n",
+                   "BEGIN;\nCREATE TABLE a (x);\nROLLBACK;\n"):
+        try:
+            split_statements(script)
+        except ValueError:
+            pass
         else:
-            print("Migration test FAILED")
-            return False
-            
-    except Exception as e:
-        print(f"Migration test ERROR: {e}")
-        return False
-    finally:
-        # Clean up
-        shutil.rmtree(test_dir)
+            raise AssertionError(f"Transaction control was not rejected: {script!r}")
 
 if __name__ == '__main__':
-    success = test_migration()
-    sys.exit(0 if success else 1)
\ No newline at end of file
+    test_migration()
+    test_unrecorded_migration_rolls_back()
+    test_split_statements()
@@ -0,0 +1,42 @@
+import os
+import sys
+
+import pytest
+
+# Add the scripts directory to the path so we can import the restore script
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+import restore_tweets_from_csv
+
+# Header, a good row, a short row, a row with empty trailing fields, a row
+# with extra fields and a quoted field spanning two lines
+MALFORMED_CSV = (
+    'CreatedAt,UserName,Text,LinkToTweet\n'
+    '"September 08, 2025 at 02:39PM",user1,text1,link1\n'
+    '"September 08, 2025 at 02:40PM",user2\n'
+    '"September 08, 2025 at 02:41PM",user3,,\n'
+    '"September 08, 2025 at 02:42PM",user4,text4,link4,extra,more\n'
+    '"September 08, 2025 at 02:43PM",user5,"multi\nline, text",link5\n'
+)
+
+EXPECTED_ROWS = [
+    ('September 08, 2025 at 02:39PM', 'user1', 'text1', 'link1'),
+    ('September 08, 2025 at 02:41PM', 'user3', '', ''),
+    ('September 08, 2025 at 02:42PM', 'user4', 'text4', 'link4'),
+    ('September 08, 2025 at 02:43PM', 'user5', 'multi\nline, text', 'link5'),
+]
+
+@pytest.mark.parametrize("use_pandas", [False, True])
+def test_read_csv_rows_malformed(tmp_path, monkeypatch, use_pandas):
+    """Test that the pandas and csv module paths read a malformed CSV alike."""
+    if use_pandas:
+        pytest.importorskip("pandas")
+    else:
+        monkeypatch.setattr(restore_tweets_from_csv, "pd", None)
+    
+    csv_path = tmp_path / "tweets.csv"
+    csv_path.write_text(MALFORMED_CSV, encoding='utf-8')
+    with open(csv_path, 'r', newline='', encoding='utf-8') as csvfile:
+        rows = [tuple(row) for row in restore_tweets_from_csv.read_csv_rows(csvfile)]
+    
+    assert rows == EXPECTED_ROWS
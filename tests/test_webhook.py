@@ -1,15 +1,15 @@
-import requests
-import json
 import sys
 import os
 
 # Add the src directory to the path so we can import the package
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../src"))
 
+from iftttwh.app import app
+
 
 # Test the IFTTT Twitter webhook handler
-def test_ifttt_twitter_webhook():
-    url = "http://localhost:5000/ifttt/twitter"
+def test_ifttt_twitter_webhook(tmp_db):
+    url = "/ifttt/twitter"
 
     # Sample payload similar to what IFTTT would send
     payload = {
@@ -19,17 +19,32 @@ def test_ifttt_twitter_webhook():
         "Text": "This is a test tweet from IFTTT",
     }
 
-    headers = {"Content-Type": "application/json"}
-
     print("Testing IFTTT Twitter webhook handler...")
 
-    try:
-        response = requests.post(url, headers=headers, data=json.dumps(payload))
+    # Call the app in-process through its WSGI test client, so no live
+    # server or socket round trip is needed
+    with app.test_client() as client:
+        response = client.post(url, json=payload)
         print(f"Status Code: {response.status_code}")
-        print(f"Response: {response.json()}")
-    except Exception as e:
-        print(f"Error: {e}")
+        print(f"Response: {response.get_json()}")
+
+    assert response.status_code == 200
+    assert response.get_json() == {"status": "success", "message": "Tweet received"}
+    assert tmp_db.execute("SELECT COUNT(*) FROM tweets").fetchone()[0] == 1
+
+
+def test_ifttt_twitter_webhook_null_text(tmp_db):
+    # A JSON object with a null Text is stored, not rejected with a 500
+    payload = {
+        "UserName": "testuser",
+        "LinkToTweet": "https://twitter.com/testuser/status/111111111",
+        "CreatedAt": "September 08, 2025 at 02:39PM",
+        "Text": None,
+    }
+
+    with app.test_client() as client:
+        response = client.post("/ifttt/twitter", json=payload)
 
+    assert response.status_code == 200
+    assert tmp_db.execute("SELECT text FROM tweets").fetchone()[0] == ""
 
-if __name__ == "__main__":
-    test_ifttt_twitter_webhook()